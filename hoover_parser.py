@@ -0,0 +1,21 @@
+import argparse
+
+class SubcommandAction(argparse.Action):
+
+    def __init__(self, *args, subcommands_map, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.subcommands_map = subcommands_map
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        setattr(namespace, self.dest, self.subcommands_map[values])
+
+class HooverParser(argparse.ArgumentParser):
+
+    def add_subcommands(self, name, subcommands):
+        subcommands_map = {c.__name__: c for c in subcommands}
+
+        self.add_argument(name,
+            choices=list(subcommands_map),
+            action=SubcommandAction,
+            subcommands_map=subcommands_map,
+        )
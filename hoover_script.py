@@ -1,29 +1,107 @@
 import sys
 import os
-import random
-import math
-import subprocess
-import shutil
+import stat
 from pathlib import Path
-from tempfile import TemporaryDirectory
-from contextlib import contextmanager
-from textwrap import dedent
-from urllib.request import urlretrieve
-from parser import HooverParser
+from functools import partial
 
 
 HOOVER_SCRIPT = """\
 #!/bin/sh
 cd '{setup}'
 export HOOVER_HOME='{home}'
+case "$1" in
+  search|snoop2)
+    app="$1"
+    shift
+    exec "$HOOVER_HOME/venvs/$app/bin/python" "$HOOVER_HOME/$app/manage.py" "$@"
+    ;;
+esac
 exec {python} hoover_script.py "$@"
 """
 
+# runs several management commands in one interpreter, so django is only
+# imported and set up once; a manage.py that exits 0 must not end the batch
+MANAGE_PY_BATCH = """\
+import os, runpy, sys
+sys.path[0] = os.path.dirname({manage_py!r})
+for args in {commands!r}:
+    sys.argv = [{manage_py!r}] + args
+    try:
+        runpy.run_path({manage_py!r}, run_name='__main__')
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            raise
+"""
+
+SEARCH_SETTINGS = """\
+from pathlib import Path
+base_dir = Path(__file__).absolute().parent.parent.parent.parent
+SECRET_KEY = {secret_key!r}
+DATABASES = {{
+    'default': {{
+        'ENGINE': 'django.db.backends.postgresql_psycopg2',
+        'NAME': {db_name!r},
+    }},
+}}
+
+INSTALLED_APPS = (
+    {oauth_app}
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'hoover.search',
+)
+
+ALLOWED_HOSTS = {allowed_hosts!r}
+
+STATIC_ROOT = str(base_dir / 'static')
+HOOVER_UPLOADS_ROOT = str(base_dir / 'uploads')
+HOOVER_ELASTICSEARCH_URL = {es_url!r}
+HOOVER_UI_ROOT = {ui_root!r}
+
+HOOVER_OAUTH_LIQUID_URL = {oauth_liquid_url!r}
+HOOVER_OAUTH_LIQUID_CLIENT_ID = {oauth_client_id!r}
+HOOVER_OAUTH_LIQUID_CLIENT_SECRET = {oauth_client_secret!r}
+"""
+
+SNOOP2_SETTINGS = """\
+SECRET_KEY = {secret_key!r}
+DATABASES = {{
+    'default': {{
+        'ENGINE': 'django.db.backends.postgresql_psycopg2',
+        'NAME': {db_name!r},
+    }}
+}}
+
+ALLOWED_HOSTS = ["localhost"]
+
+SNOOP_TIKA_SERVER_ENDPOINT = {tika_url!r}
+SNOOP_BLOB_STORAGE = {blobs!r}
+"""
+
 _home = os.environ.get('HOOVER_HOME')
 if not _home:
     raise RuntimeError("HOOVER_HOME environment variable is not set")
 home = Path(_home)
 
+SEARCH_VENV_BIN = home / 'venvs' / 'search' / 'bin'
+SNOOP2_VENV_BIN = home / 'venvs' / 'snoop2' / 'bin'
+SEARCH_MANAGE_PY = home / 'search' / 'manage.py'
+SNOOP2_MANAGE_PY = home / 'snoop2' / 'manage.py'
+SEARCH_LOCAL_PY = home / 'search' / 'hoover' / 'site' / 'settings' / 'local.py'
+SNOOP2_LOCAL_PY = home / 'snoop2' / 'snoop' / 'localsettings.py'
+UI_LOCK_HASH = home / 'cache' / 'ui-lock.sha'
+
+VENV_BIN = {'search': SEARCH_VENV_BIN, 'snoop2': SNOOP2_VENV_BIN}
+MANAGE_PY = {'search': SEARCH_MANAGE_PY, 'snoop2': SNOOP2_MANAGE_PY}
+WSGI_APP = {
+    'search': 'hoover.site.wsgi:application',
+    'snoop2': 'snoop.wsgi:application',
+}
+
 interactive_mode = False
 
 param_list = []
@@ -47,8 +125,9 @@ class Param:
         if self.value is not None:
             return self.value
 
-        if os.getenv(self.environ):
-            self.value = os.getenv(self.environ)
+        environ_value = os.getenv(self.environ)
+        if environ_value:
+            self.value = environ_value
         elif interactive_mode and self.required and self.question_label is not None:
             self.value = self._question(self.question_label, self.default)
         else:
@@ -64,24 +143,6 @@ class Param:
         return Path(self.get())
 
 class Params:
-    virtualenv_url = Param(
-        name = 'virtualenv_url',
-        default = 'https://github.com/pypa/virtualenv/raw/master/virtualenv.py',
-        environ = 'HOOVER_VIRTUALENV_URL'
-    )
-
-    setuptools_url = Param(
-        name = 'setuptools_url',
-        default = 'https://pypi.python.org/packages/8a/1f/e2e14f0b98d0b6de6c3fb4e8a3b45d3b8907783937c497cb53539c0d2b19/setuptools-28.6.1-py2.py3-none-any.whl',
-        environ = 'HOOVER_SETUPTOOLS_URL'
-    )
-
-    pip_url = Param(
-        name = 'pip_url',
-        default = 'https://pypi.python.org/packages/9c/32/004ce0852e0a127f07f358b715015763273799bd798956fa930814b60f39/pip-8.1.2-py2.py3-none-any.whl',
-        environ = 'HOOVER_PIP_URL'
-    )
-
     search_repo = Param(
         name = 'search_repo',
         default = 'https://github.com/hoover/search.git',
@@ -95,6 +156,20 @@ class Params:
         required = False
     )
 
+    webserver_exec = Param(
+        name = 'webserver_exec',
+        default = False,
+        environ = 'HOOVER_WEBSERVER_EXEC',
+        required = False
+    )
+
+    use_uv = Param(
+        name = 'use_uv',
+        default = False,
+        environ = 'HOOVER_USE_UV',
+        required = False
+    )
+
     snoop2_repo = Param(
         name = 'snoop2_repo',
         default = 'https://github.com/hoover/snoop2.git',
@@ -182,269 +257,344 @@ class Params:
         required = False
     )
 
-for param in param_list:
-    param.get()
-
 def list_params(args):
     print("Listing HOOVER SETUP params...")
     print()
-    for param in Params.param_list:
+    for param in param_list:
         print("====", param.name, "====")
         print("label:    ", param.question_label)
         print("env:      ", param.environ)
         print("default:  ", param.default)
-        print("optional: ", param.optional)
+        print("optional: ", not param.required)
         print("value:    ", param.get())
         print()
 
+# shared by all runcmd calls; callers that need extra variables pass
+# their own env=dict(SUBPROCESS_ENV, ...) instead of mutating this one
+SUBPROCESS_ENV = {k: v for k, v in os.environ.items()
+    if k != '__PYVENV_LAUNCHER__'}
+SUBPROCESS_ENV.setdefault('PIP_DISABLE_PIP_VERSION_CHECK', '1')
+
 def runcmd(cmd, **kwargs):
-    if 'env' not in kwargs:
-        kwargs['env'] = dict(os.environ)
-        kwargs['env'].pop('__PYVENV_LAUNCHER__', None)
-    subprocess.check_call([str(c) for c in cmd], **kwargs)
-
-@contextmanager
-def tmp_virtualenv():
-    with TemporaryDirectory() as _tmp:
-        def download(url, directory):
-            name = url.split('/')[-1]
-            urlretrieve(url, str(directory / name))
-
-        def run(target):
-            runcmd([
-                sys.executable,
-                tmp / 'virtualenv.py',
-                '--extra-search-dir={}'.format(tmp),
-                target,
-            ])
-            runcmd([
-                target / 'bin' / 'pip',
-                'install', '-U', 'setuptools', 'pip',
-            ])
-
-        tmp = Path(_tmp)
-        download(Params.virtualenv_url.get(), tmp)
-        download(Params.setuptools_url.get(), tmp)
-        download(Params.pip_url.get(), tmp)
-        yield run
+    import subprocess
+    kwargs.setdefault('env', SUBPROCESS_ENV)
+    subprocess.check_call(cmd, **kwargs)
+
+def run_parallel(*tasks):
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+    executor = ThreadPoolExecutor(max_workers=len(tasks))
+    futures = [executor.submit(task) for task in tasks]
+    (done, _) = wait(futures, return_when=FIRST_EXCEPTION)
+    executor.shutdown(wait=False)
+    for future in done:
+        future.result()
+
+def uv_executable():
+    if not Params.use_uv.get():
+        return None
+    import shutil
+    uv = shutil.which('uv')
+    if uv is None:
+        raise RuntimeError("HOOVER_USE_UV is set but uv was not found on PATH")
+    return uv
+
+def create_virtualenv(target):
+    uv = uv_executable()
+    if uv:
+        # --seed keeps pip in the venv, pip-sync needs it on upgrade
+        runcmd([uv, 'venv', '--seed', '--python', sys.executable, target])
+        return
+    runcmd([sys.executable, '-m', 'venv', '--symlinks', target])
+    runcmd([target / 'bin' / 'pip', 'install', '-U', 'setuptools', 'pip'])
+
+def install_requirements(name):
+    uv = uv_executable()
+    requirements = home / name / 'requirements.txt'
+    if uv:
+        runcmd([
+            uv, 'pip', 'install',
+            '--python', VENV_BIN[name] / 'python',
+            '-r', requirements,
+        ])
+        return
+    runcmd([
+        VENV_BIN[name] / 'pip', 'install', '--prefer-binary',
+        '-r', requirements,
+    ])
 
-def git_clone(url, directory):
-    runcmd(['git', 'clone', url], cwd=str(directory))
+def create_app_virtualenv(name):
+    create_virtualenv(VENV_BIN[name].parent)
+    install_requirements(name)
 
-def migrate():
-    manage_py('search', 'migrate')
-    manage_py('snoop2', 'migrate')
+def git_clone(url, directory):
+    runcmd([
+        'git', '-c', 'submodule.fetchJobs=4',
+        'clone', '--recurse-submodules', '--jobs=4',
+        '--depth=1', '--single-branch', '--no-tags', '--shallow-submodules',
+        url,
+    ], cwd=directory)
+
+def ui_lock_digest(ui):
+    import hashlib
+    # without a lockfile, package.json is the best record of what was installed
+    for name in ['package-lock.json', 'package.json']:
+        if (ui / name).exists():
+            return hashlib.sha256((ui / name).read_bytes()).hexdigest()
+    return None
+
+def install_ui_dependencies():
+    ui = home / 'ui'
+    installed = (ui / 'node_modules').is_dir() and UI_LOCK_HASH.exists()
+    if installed and UI_LOCK_HASH.read_text() == ui_lock_digest(ui):
+        return
+    if (ui / 'package-lock.json').exists():
+        runcmd(['npm', 'ci'], cwd=ui)
+    else:
+        runcmd(['npm', 'install'], cwd=ui)
+    # hashed after installing, npm install may have written a lockfile
+    digest = ui_lock_digest(ui)
+    if digest is not None:
+        UI_LOCK_HASH.parent.mkdir(exist_ok=True, parents=True)
+        UI_LOCK_HASH.write_text(digest)
+
+def build_ui():
+    install_ui_dependencies()
+    runcmd(['./run', 'build'], cwd=home / 'ui')
 
 def preflight(run_migrations=True):
+    search_commands = [['downloadassets'], ['collectstatic', '--noinput']]
+    tasks = [build_ui]
     if run_migrations:
-        migrate()
-    manage_py('search', 'downloadassets')
-    manage_py('search', 'collectstatic', '--noinput')
-    runcmd(['npm', 'install'], cwd=str(home / 'ui'))
-    runcmd(['./run', 'build'], cwd=str(home / 'ui'))
+        search_commands.insert(0, ['migrate'])
+        tasks.append(partial(manage_py, 'snoop2', 'migrate'))
+    tasks.append(partial(manage_py_batch, 'search', *search_commands))
+    run_parallel(*tasks)
 
 def create_scripts():
     (home / 'bin').mkdir(exist_ok=True)
     bin_hoover = home / 'bin' / 'hoover'
-    with bin_hoover.open('w', encoding='utf-8') as f:
-        f.write(HOOVER_SCRIPT.format(
-            python=sys.executable,
-            home=home,
-            setup=home / 'setup',
-        ))
-    bin_hoover.chmod(0o755)
+    script = HOOVER_SCRIPT.format(
+        python=sys.executable,
+        home=home,
+        setup=home / 'setup',
+    )
+    fd = os.open(str(bin_hoover), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+    try:
+        os.write(fd, script.encode('utf-8'))
+    finally:
+        os.close(fd)
 
 def bootstrap(args):
-    git_clone(Params.search_repo.get(), home)
-    git_clone(Params.snoop2_repo.get(), home)
-    git_clone(Params.ui_repo.get(), home)
-
-    with tmp_virtualenv() as create_virtualenv:
-        create_virtualenv(home / 'venvs' / 'search')
-        create_virtualenv(home / 'venvs' / 'snoop2')
-
-    venv = lambda name, cmd: home / 'venvs' / name / 'bin' / cmd
-    runcmd([
-        venv('search', 'pip'), 'install',
-        '-r', home / 'search' / 'requirements.txt',
-    ])
-    runcmd([
-        venv('snoop2', 'pip'), 'install',
-        '-r', home / 'snoop2' / 'requirements.txt',
-    ])
     create_scripts()
+    run_parallel(
+        partial(git_clone, Params.search_repo.get(), home),
+        partial(git_clone, Params.snoop2_repo.get(), home),
+        partial(git_clone, Params.ui_repo.get(), home),
+    )
+
+    # npm shares nothing with the python side, so the ui dependencies are
+    # installed while the venvs are built; preflight then only runs the build
+    run_parallel(
+        partial(create_app_virtualenv, 'search'),
+        partial(create_app_virtualenv, 'snoop2'),
+        install_ui_dependencies,
+    )
     configure_snoop2(exist_ok=False)
     configure_search(exist_ok=False)
     preflight(not Params.bootstrap_no_db.get())
 
-def random_secret_key(entropy=256):
-    vocabulary = ('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
-        '0123456789!@#$%^&*()-=+[]{}:.<>/?')
-    entropy_per_char = math.log(len(vocabulary), 2)
-    chars = int(math.ceil(entropy / entropy_per_char))
-    urandom = random.SystemRandom()
-    return ''.join(urandom.choice(vocabulary) for _ in range(chars))
+def random_secret_key():
+    import secrets
+    # 32 random bytes give the 256 bits of entropy we always used
+    return secrets.token_urlsafe(32)
+
+def read_local_py(local_py):
+    try:
+        return local_py.read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return None
+
+def existing_secret_key(local_py):
+    import ast
+    import re
+    content = read_local_py(local_py) or ''
+    match = re.search(r'^SECRET_KEY = (.+)$', content, re.MULTILINE)
+    if match is None:
+        return None
+    try:
+        return ast.literal_eval(match.group(1))
+    except (ValueError, SyntaxError):
+        return None
+
+def write_local_py(local_py, content, exist_ok):
+    if not exist_ok:
+        try:
+            fd = os.open(str(local_py), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            print("{!s} already exists, skipping".format(local_py))
+            return
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content.encode('utf-8'))
+        return
+
+    if read_local_py(local_py) == content:
+        return
+    # write through a symlinked local.py and keep the mode of the old file,
+    # it holds the secret key
+    target = local_py.resolve()
+    try:
+        mode = stat.S_IMODE(target.stat().st_mode)
+    except FileNotFoundError:
+        mode = 0o644
+    tmp = target.with_name(target.name + '.tmp')
+    fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    os.fchmod(fd, mode)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(content.encode('utf-8'))
+    os.replace(str(tmp), str(target))
+
+def link_local_py(local_py, real_local_py):
+    try:
+        linked = os.readlink(str(local_py)) == str(real_local_py)
+    except OSError:
+        # missing, or a regular file that symlink_to will refuse to replace
+        linked = False
+    if not linked:
+        local_py.symlink_to(real_local_py)
 
 def configure_search(exist_ok = True):
-    local_py = home / 'search' / 'hoover' / 'site' / 'settings' / 'local.py'
+    local_py = SEARCH_LOCAL_PY
     if not exist_ok and local_py.exists():
         print("{!s} already exists, skipping".format(local_py))
         return
 
-    if Params.config_dir.get() is not None:
-        config_dir = Path(Params.config_dir.get())
-        config_dir.mkdir(exist_ok=True, parents=True)
-        (config_dir / 'search').mkdir(exist_ok=True)
-        real_local_py = config_dir / 'search' / 'local.py'
-        if not local_py.is_symlink() or not local_py.resolve().samefile(real_local_py):
-            local_py.symlink_to(real_local_py)
+    config_dir = Params.config_dir.get()
+    if config_dir is not None:
+        real_local_py = Path(config_dir) / 'search' / 'local.py'
+        real_local_py.parent.mkdir(exist_ok=True, parents=True)
+        link_local_py(local_py, real_local_py)
         local_py = real_local_py
 
+    oauth_liquid_url = Params.oauth_liquid_url.get()
     print("Configuration values for hoover-search")
     values = {
         'ui_root': str(home / 'ui' / 'build'),
-        'secret_key': random_secret_key(),
+        'secret_key': existing_secret_key(local_py) or random_secret_key(),
         'db_name': Params.search_db.get(),
         'es_url': Params.es_url.get(),
         'allowed_hosts': Params.allowed_hosts.get().split(),
         'oauth_client_id': Params.oauth_client_id.get(),
         'oauth_client_secret': Params.oauth_client_secret.get(),
-        'oauth_liquid_url': Params.oauth_liquid_url.get(),
-        'oauth_app': '"hoover.contrib.oauth2",' if Params.oauth_liquid_url.get() else "",
+        'oauth_liquid_url': oauth_liquid_url,
+        'oauth_app': '"hoover.contrib.oauth2",' if oauth_liquid_url else "",
     }
-    template = dedent("""\
-        from pathlib import Path
-        base_dir = Path(__file__).absolute().parent.parent.parent.parent
-        SECRET_KEY = {secret_key!r}
-        DATABASES = {{
-            'default': {{
-                'ENGINE': 'django.db.backends.postgresql_psycopg2',
-                'NAME': {db_name!r},
-            }},
-        }}
-
-        INSTALLED_APPS = (
-            {oauth_app}
-            'django.contrib.admin',
-            'django.contrib.auth',
-            'django.contrib.contenttypes',
-            'django.contrib.sessions',
-            'django.contrib.messages',
-            'django.contrib.staticfiles',
-            'hoover.search',
-        )
-
-        ALLOWED_HOSTS = {allowed_hosts!r}
-
-        STATIC_ROOT = str(base_dir / 'static')
-        HOOVER_UPLOADS_ROOT = str(base_dir / 'uploads')
-        HOOVER_ELASTICSEARCH_URL = {es_url!r}
-        HOOVER_UI_ROOT = {ui_root!r}
-
-        HOOVER_OAUTH_LIQUID_URL = {oauth_liquid_url!r}
-        HOOVER_OAUTH_LIQUID_CLIENT_ID = {oauth_client_id!r}
-        HOOVER_OAUTH_LIQUID_CLIENT_SECRET = {oauth_client_secret!r}
-    """)
-    with local_py.open('w', encoding='utf-8') as f:
-        f.write(template.format(**values))
+    write_local_py(local_py, SEARCH_SETTINGS.format(**values), exist_ok)
 
 def configure_snoop2(exist_ok = True):
-    local_py = home / 'snoop2' / 'snoop' / 'localsettings.py'
+    local_py = SNOOP2_LOCAL_PY
     if not exist_ok and local_py.exists():
         print("{!s} already exists, skipping".format(local_py))
         return
 
-    if Params.config_dir.get() is not None:
-        config_dir = Path(Params.config_dir.get())
-        config_dir.mkdir(exist_ok=True, parents=True)
-        (config_dir / 'snoop2').mkdir(exist_ok=True)
-        real_local_py = config_dir / 'snoop2' / 'local.py'
-        if not local_py.is_symlink() or not local_py.resolve().samefile(real_local_py):
-            local_py.symlink_to(real_local_py)
+    config_dir = Params.config_dir.get()
+    if config_dir is not None:
+        real_local_py = Path(config_dir) / 'snoop2' / 'local.py'
+        real_local_py.parent.mkdir(exist_ok=True, parents=True)
+        link_local_py(local_py, real_local_py)
         local_py = real_local_py
 
-    Path(Params.snoop2_blobs.get()).mkdir(exist_ok=True, parents=True)
+    blobs = Params.snoop2_blobs.get()
+    Path(blobs).mkdir(exist_ok=True, parents=True)
 
     print("Configuration values for hoover-snoop2")
     values = {
-        'secret_key': random_secret_key(),
+        'secret_key': existing_secret_key(local_py) or random_secret_key(),
         'db_name':  Params.snoop2_db.get(),
         'tika_url': Params.tika_url.get(),
-        'blobs': Params.snoop2_blobs.get(),
+        'blobs': blobs,
     }
-    template = dedent("""\
-        SECRET_KEY = {secret_key!r}
-        DATABASES = {{
-            'default': {{
-                'ENGINE': 'django.db.backends.postgresql_psycopg2',
-                'NAME': {db_name!r},
-            }}
-        }}
-
-        ALLOWED_HOSTS = ["localhost"]
-
-        SNOOP_TIKA_SERVER_ENDPOINT = {tika_url!r}
-        SNOOP_BLOB_STORAGE = {blobs!r}
-    """)
-    with local_py.open('w', encoding='utf-8') as f:
-        f.write(template.format(**values))
+    write_local_py(local_py, SNOOP2_SETTINGS.format(**values), exist_ok)
 
 def reconfigure(args):
     configure_search(exist_ok=True)
     configure_snoop2(exist_ok=True)
 
 def update(args):
-    runcmd(['git', 'pull'], cwd=str(home / 'setup'))
+    runcmd(['git', 'pull'], cwd=home / 'setup')
     create_scripts()
 
 def manage_py(name, *args):
-    python = home / 'venvs' / name / 'bin' / 'python'
-    runcmd([python, home / name / 'manage.py'] + list(args))
+    runcmd([VENV_BIN[name] / 'python', MANAGE_PY[name]] + list(args))
+
+def manage_py_batch(name, *commands):
+    script = MANAGE_PY_BATCH.format(
+        manage_py=str(MANAGE_PY[name]),
+        commands=[list(c) for c in commands],
+    )
+    runcmd([VENV_BIN[name] / 'python', '-c', script])
+
+def upgrade_app(name):
+    runcmd(['git', 'pull', '--recurse-submodules'], cwd=home / name)
+    runcmd([VENV_BIN[name] / 'pip-sync'], cwd=home / name)
 
 def upgrade(args):
-    runcmd(['git', 'pull'], cwd=str(home / 'search'))
-    runcmd(['git', 'pull'], cwd=str(home / 'snoop2'))
-    runcmd(['git', 'pull'], cwd=str(home / 'ui'))
-    runcmd([home / 'venvs' / 'search' / 'bin' / 'pip-sync'],
-        cwd=str(home / 'search'))
-    runcmd([home / 'venvs' / 'snoop2' / 'bin' / 'pip-sync'],
-        cwd=str(home / 'snoop2'))
+    run_parallel(
+        partial(upgrade_app, 'search'),
+        partial(upgrade_app, 'snoop2'),
+        partial(runcmd, ['git', 'pull', '--recurse-submodules'], cwd=home / 'ui'),
+    )
     preflight()
 
 def execv(args):
     os.execv(args[0], args)
 
 def webserver(args):
+    from hoover_parser import HooverParser
     parser = HooverParser(description="Run webserver")
     parser.add_argument('server', choices=['search', 'snoop2'])
     (options, extra_args) = parser.parse_known_args(args)
-
-    if options.server == 'search':
-        waitress = str(home / 'venvs' / 'search' / 'bin' / 'waitress-serve')
-        os.chdir(str(home / 'search'))
-        execv([waitress] + extra_args + ['hoover.site.wsgi:application'])
-
-    if options.server == 'snoop2':
-        waitress = str(home / 'venvs' / 'snoop2' / 'bin' / 'waitress-serve')
-        os.chdir(str(home / 'snoop2'))
-        execv([waitress] + extra_args + ['snoop.wsgi:application'])
+    name = options.server
+    argv = extra_args + [WSGI_APP[name]]
+    os.chdir(home / name)
+
+    site_packages = (home / 'venvs' / name / 'lib' /
+        'python{}.{}'.format(*sys.version_info[:2]) / 'site-packages')
+    if Params.webserver_exec.get() or not site_packages.is_dir():
+        execv([VENV_BIN[name] / 'waitress-serve'] + argv)
+
+    # the venv runs our python version, so serve the app from this process
+    # instead of booting a second interpreter for waitress-serve
+    # drop the system and user site dirs, like the venv interpreter would,
+    # and append the venv's after the stdlib
+    import site
+    system_site = site.getsitepackages() + [site.getusersitepackages()]
+    sys.path[:] = [p for p in sys.path
+        if not any(p == s or p.startswith(s + os.sep) for s in system_site)]
+    site.addsitedir(str(site_packages))
+    from waitress.runner import run
+    sys.exit(run(['waitress-serve'] + argv))
 
 def snoop2(args):
-    py = str(home / 'venvs' / 'snoop2' / 'bin' / 'python')
-    manage_py = str(home / 'snoop2' / 'manage.py')
-    execv([py, manage_py] + args)
+    execv([SNOOP2_VENV_BIN / 'python', SNOOP2_MANAGE_PY] + args)
 
 def search(args):
-    py = str(home / 'venvs' / 'search' / 'bin' / 'python')
-    manage_py = str(home / 'search' / 'manage.py')
-    execv([py, manage_py] + args)
+    execv([SEARCH_VENV_BIN / 'python', SEARCH_MANAGE_PY] + args)
+
+SUBCOMMANDS = [
+    bootstrap, reconfigure, update, upgrade,
+    webserver, snoop2, search, list_params,
+]
+SUBCOMMANDS_MAP = {c.__name__: c for c in SUBCOMMANDS}
 
 def main():
+    argv = sys.argv[1:]
+    if argv and argv[0] in SUBCOMMANDS_MAP:
+        return SUBCOMMANDS_MAP[argv[0]](argv[1:])
+
+    # no known subcommand; let argparse print the usage or error
+    from hoover_parser import HooverParser
     parser = HooverParser(description="Hoover setup")
-    parser.add_subcommands('cmd', [
-        bootstrap, reconfigure, update, upgrade,
-        webserver, snoop2, search, list_params,
-    ])
+    parser.add_subcommands('cmd', SUBCOMMANDS)
     (options, extra_args) = parser.parse_known_args()
     options.cmd(extra_args)
 
@@ -2,23 +2,60 @@ import sys
 import os
 from pathlib import Path
 import subprocess
+import shutil
 
 SETUP_REPO = os.getenv('HOOVER_SETUP_REPO', 'https://github.com/hoover/setup.git')
 SETUP_BRANCH = os.getenv('HOOVER_SETUP_BRANCH', 'master')
+REQUIRED_COMMANDS = ['git', 'npm']
+# hoover_script.py clones with --no-tags (2.14), --jobs and --shallow-submodules
+MIN_GIT_VERSION = (2, 14)
 
 if os.getenv('HOOVER_HOME'):
     home = Path(os.getenv('HOOVER_HOME'))
 else:
     home = Path.cwd() / 'hoover'
 
+def is_empty(directory):
+    with os.scandir(str(directory)) as entries:
+        return next(entries, None) is None
+
+def has_ensurepip():
+    import importlib.util
+    return importlib.util.find_spec('ensurepip') is not None
+
+def git_version():
+    import re
+    output = subprocess.check_output(['git', '--version']).decode()
+    match = re.search(r'(\d+)\.(\d+)', output)
+    return tuple(int(n) for n in match.groups()) if match else (0, 0)
+
 def main():
-    if home.is_dir() and len(list(home.iterdir())) > 0:
+    required = REQUIRED_COMMANDS + (['uv'] if os.getenv('HOOVER_USE_UV') else [])
+    missing = [c for c in required if shutil.which(c) is None]
+    if missing:
+        print("Required commands not found: {}".format(', '.join(missing)))
+        sys.exit(1)
+
+    if git_version() < MIN_GIT_VERSION:
+        print("git {}.{} or newer is required.".format(*MIN_GIT_VERSION))
+        sys.exit(1)
+
+    # `python -m venv` needs ensurepip, which debian and ubuntu ship separately
+    if not os.getenv('HOOVER_USE_UV') and not has_ensurepip():
+        print("The ensurepip module is missing, so virtualenvs can't be created.")
+        print("Please install it (the python3-venv package on Debian/Ubuntu), or set HOOVER_USE_UV.")
+        sys.exit(1)
+
+    if home.is_dir() and not is_empty(home):
         print("Installation folder {} exists and is not empty.".format(str(home)))
         print("Please specify a suitable path using the HOOVER_HOME environment variable.")
+        sys.exit(1)
     home.mkdir(exist_ok=True)
 
-    subprocess.check_call(['git', 'clone', SETUP_REPO], cwd=str(home))
-    subprocess.check_call(['git', 'checkout', SETUP_BRANCH], cwd=str(home / 'setup'))
+    subprocess.check_call([
+        'git', 'clone', '--filter=blob:none', '--single-branch',
+        '--branch', SETUP_BRANCH, SETUP_REPO,
+    ], cwd=str(home))
     args = [
         sys.executable,
         str(home / 'setup' / 'hoover_script.py'),
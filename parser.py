@@ -1,15 +0,0 @@
-import argparse
-
-class HooverParser(argparse.ArgumentParser):
-
-    def add_subcommands(self, name, subcommands):
-        subcommands_map = {c.__name__: c for c in subcommands}
-
-        class SubcommandAction(argparse.Action):
-            def __call__(self, parser, namespace, values, option_string=None):
-                setattr(namespace, name, subcommands_map[values])
-
-        self.add_argument(name,
-            choices=[c.__name__ for c in subcommands],
-            action=SubcommandAction,
-        )
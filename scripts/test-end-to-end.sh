@@ -9,9 +9,6 @@ export HOOVER_BOOTSTRAP_NO_DB=True
 export HOOVER_ALLOWED_HOSTS="localhost https://hoover.example.org"
 export HOOVER_CONFIG_DIR="$HOOVER_HOME/the/configuration/path"
 
-#export HOOVER_VIRTUALENV_URL
-#export HOOVER_SETUPTOOLS_URL
-#export HOOVER_PIP_URL
 #export HOOVER_ES_URL
 #export HOOVER_SNOOP2_TIKA_URL
 #export HOOVER_SETUP_REPO